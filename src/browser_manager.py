@@ -2,10 +2,14 @@
 
 import asyncio
 import os
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import anyio
 from playwright.async_api import (
     async_playwright,
     Browser,
+    BrowserContext,
     Page,
     Playwright,
     Error as PlaywrightError,
@@ -18,14 +22,32 @@ class BrowserManager:
     _instance: Optional['BrowserManager'] = None
     _playwright: Optional[Playwright] = None
     _browser: Optional[Browser] = None
+    _context: Optional[BrowserContext] = None
+    _isolated_context: Optional[BrowserContext] = None
     _page: Optional[Page] = None
+    _retired_page: Optional[Page] = None
+    _loaded: Optional[tuple] = None
+    _pool: Optional[asyncio.Queue] = None
+    _refill_task: Optional[asyncio.Task] = None
+    _ready: Optional[asyncio.Task] = None
+    _users: int = 0
+    _connected: bool = False
     _lock: asyncio.Lock = asyncio.Lock()
+    _page_lock: asyncio.Lock = asyncio.Lock()
 
     # Configuration from environment
     _headless: bool = os.getenv("HEADLESS", "true").lower() == "true"
     _browser_timeout: int = int(os.getenv("BROWSER_TIMEOUT", "30000"))
     _viewport_width: int = int(os.getenv("VIEWPORT_WIDTH", "1920"))
     _viewport_height: int = int(os.getenv("VIEWPORT_HEIGHT", "1080"))
+    _pool_size: int = int(os.getenv("POOL_SIZE", "1"))
+    _disable_images: bool = os.getenv("DISABLE_IMAGES", "false").lower() == "true"
+
+    # Navigation wait_until states, from earliest to latest
+    _LOAD_STATES: dict = {'domcontentloaded': 0, 'load': 1, 'networkidle': 2}
+
+    # Every context is created with this viewport and it is never resized
+    _viewport: dict = {'width': _viewport_width, 'height': _viewport_height}
 
     def __new__(cls) -> 'BrowserManager':
         """Singleton pattern implementation - only one instance exists."""
@@ -33,10 +55,25 @@ class BrowserManager:
             cls._instance = super().__new__(cls)
         return cls._instance
 
+    @classmethod
+    def instance(cls) -> 'BrowserManager':
+        """
+        Return the singleton instance, creating it on first use.
+
+        Returns:
+            BrowserManager: The singleton instance
+        """
+        return cls._instance or cls()
+
     async def ensure_browser(self) -> Page:
         """
         Initialize browser if needed and return the current page.
 
+        The steady-state path is a single attribute check; no lock is taken
+        and no call crosses into Playwright, since page close/crash events
+        clear the active page. Otherwise callers share one in-flight initialization task,
+        so concurrent first calls launch the browser only once.
+
         Returns:
             Page: Active Playwright page instance
 
@@ -44,29 +81,75 @@ class BrowserManager:
             PlaywrightError: If browser fails to launch
             TimeoutError: If browser launch exceeds timeout
         """
+        if self._page is not None:
+            return self._page
+
+        # Shield so one cancelled caller does not abort the shared initialization
+        return await asyncio.shield(self._start_initialize())
+
+    def warm_up(self) -> None:
+        """
+        Start browser initialization in the background without waiting for it.
+
+        Launch errors are not raised here; they resurface on the next
+        ensure_browser() call, where tools turn them into error responses.
+        """
+        if self._page is None:
+            self._start_initialize().add_done_callback(
+                lambda task: task.cancelled() or task.exception()
+            )
+
+    def _start_initialize(self) -> asyncio.Task:
+        """Return the in-flight initialization task, starting one if none is running."""
+        if self._ready is None or self._ready.done():
+            self._ready = asyncio.create_task(self._initialize())
+        return self._ready
+
+    async def _initialize(self) -> Page:
+        """
+        Launch the browser if needed and install a new active page.
+
+        On first use the browser and its shared context are launched and the
+        active page is created right away, while the pool of pre-warmed pages
+        fills in the background. All pooled pages live in the shared context,
+        so they share its HTTP cache. When the active page has been closed or
+        has crashed, a warm replacement is taken from the pool.
+
+        Returns:
+            Page: Active Playwright page instance
+        """
         async with self._lock:
-            if self._page is None or self._page.is_closed():
+            if self._page is None:
                 try:
                     # Start Playwright
                     if self._playwright is None:
                         self._playwright = await async_playwright().start()
 
-                    # Launch browser
-                    self._browser = await self._playwright.chromium.launch(
-                        headless=self._headless,
-                        timeout=self._browser_timeout,
-                    )
+                    # Launch browser; the pool warms up after checkout
+                    if self._browser is None or not self._connected:
+                        self._browser = await self._playwright.chromium.launch(
+                            headless=self._headless,
+                            timeout=self._browser_timeout,
+                            args=(
+                                ["--blink-settings=imagesEnabled=false"]
+                                if self._disable_images else []
+                            ),
+                        )
+                        self._browser.on("disconnected", self._on_disconnected)
+                        self._connected = True
+                        self._context = await self._browser.new_context(
+                            viewport=dict(self._viewport)
+                        )
+                        self._isolated_context = None
+                        self._retired_page = None
+                        self._pool = asyncio.Queue(maxsize=self._pool_size)
+                    else:
+                        await self._dispose_retired()
 
-                    # Create context with viewport
-                    context = await self._browser.new_context(
-                        viewport={
-                            'width': self._viewport_width,
-                            'height': self._viewport_height,
-                        }
-                    )
-
-                    # Create page
-                    self._page = await context.new_page()
+                    # Check out a warm page and top the pool back up
+                    self._page = await self._checkout()
+                    if self._refill_task is None or self._refill_task.done():
+                        self._refill_task = asyncio.create_task(self._fill_pool())
 
                 except TimeoutError as e:
                     raise TimeoutError(
@@ -85,6 +168,189 @@ class BrowserManager:
 
             return self._page
 
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Page]:
+        """
+        Hold the active page exclusively for the duration of a tool call.
+
+        Tool calls are serialized: a second caller waits until the first
+        leaves the block, so their actions never interleave on the page.
+
+        Usage:
+            async with browser_manager.acquire() as page:
+                await page.goto(url)
+
+        Yields:
+            Page: Active Playwright page instance
+        """
+        async with self._page_lock:
+            yield await self.ensure_browser()
+
+    async def isolate(self) -> Page:
+        """
+        Replace the active page with one in a fresh, isolated context.
+
+        The new context has its own cookies, cache and storage. The previous
+        active page is closed (together with its context, if it was isolated).
+        Waits for in-flight tool calls, since it holds the page lock.
+
+        Returns:
+            Page: New active Playwright page instance
+        """
+        async with self.acquire():
+            return await self.isolate_locked()
+
+    async def isolate_locked(self) -> Page:
+        """
+        Same as isolate(), for callers already inside an acquire() block.
+
+        Use the returned page for the rest of the block; the page yielded
+        by acquire() has been closed.
+
+        Returns:
+            Page: New active Playwright page instance
+        """
+        await self.ensure_browser()
+        async with self._lock:
+            context = await self._browser.new_context(viewport=dict(self._viewport))
+            page = await self._new_page(context)
+
+            previous_page, previous_context = self._page, self._isolated_context
+            self._page, self._isolated_context = page, context
+
+            if previous_context is not None:
+                await self._close_context(previous_context)
+            elif previous_page is not None:
+                await self._close_page(previous_page)
+
+            return page
+
+    def record_navigation(self, page: Page, url: str, wait_until: str) -> None:
+        """
+        Remember that a navigation to url completed on page.
+
+        Args:
+            page: Page the navigation ran on
+            url: URL that was requested
+            wait_until: Load state the navigation waited for
+        """
+        self._loaded = (page, url, page.url, wait_until)
+
+    def forget_navigation(self) -> None:
+        """Forget the last completed navigation, e.g. before starting a new one."""
+        self._loaded = None
+
+    def has_loaded(self, page: Page, url: str, wait_until: str) -> bool:
+        """
+        Check whether page already finished loading url and has not moved since.
+
+        Only a navigation recorded with record_navigation() counts: page.url
+        changes as soon as a navigation commits, even if loading then fails.
+
+        Args:
+            page: Page to check
+            url: URL that is about to be requested
+            wait_until: Load state the caller wants to wait for
+
+        Returns:
+            bool: True if navigating again would not change anything
+        """
+        if self._loaded is None:
+            return False
+        loaded_page, loaded_url, page_url, loaded_state = self._loaded
+        return (
+            loaded_page is page
+            and loaded_url == url
+            and page.url == page_url
+            # Network activity may have resumed, so "networkidle" is never assumed
+            and wait_until != "networkidle"
+            and self._LOAD_STATES[wait_until] <= self._LOAD_STATES[loaded_state]
+        )
+
+    async def new_page(self) -> Page:
+        """
+        Open an extra page in the shared context, separate from the active page.
+
+        The caller owns the page and is responsible for closing it; tools
+        keep working on the active page.
+
+        Returns:
+            Page: New Playwright page instance
+        """
+        await self.ensure_browser()
+        return await self._context.new_page()
+
+    async def _new_page(self, context: Optional[BrowserContext] = None) -> Page:
+        """Open a page, in the shared context by default, and watch it for close/crash."""
+        page = await (context or self._context).new_page()
+        page.on("close", self._on_page_gone)
+        page.on("crash", self._on_page_gone)
+        return page
+
+    async def _fill_pool(self) -> None:
+        """Top the pool up with pre-warmed pages, created concurrently."""
+        pool = self._pool
+        if pool is None:
+            return
+
+        missing = pool.maxsize - pool.qsize()
+        results = await asyncio.gather(
+            *(self._new_page() for _ in range(missing)),
+            return_exceptions=True,
+        )
+
+        # Pool is best-effort; _checkout falls back to a fresh page
+        for result in results:
+            if not isinstance(result, BaseException) and not pool.full():
+                pool.put_nowait(result)
+
+    async def _checkout(self) -> Page:
+        """Take a warm page from the pool, or open one if it is empty."""
+        while self._pool is not None and not self._pool.empty():
+            page = self._pool.get_nowait()
+            if not page.is_closed():
+                return page
+        return await self._new_page()
+
+    async def _dispose_retired(self) -> None:
+        """Close what is left of the last active page after it closed or crashed."""
+        if self._isolated_context is not None:
+            await self._close_context(self._isolated_context)
+            self._isolated_context = None
+        elif self._retired_page is not None:
+            await self._close_page(self._retired_page)
+        self._retired_page = None
+
+    def _on_page_gone(self, page: Page) -> None:
+        """Drop a closed or crashed active page so the next call swaps in a warm one."""
+        if self._page is page:
+            self._page = None
+            self._retired_page = page
+            self._loaded = None
+
+    def _on_disconnected(self, browser: Browser) -> None:
+        """Mark the browser as gone so the next call relaunches it."""
+        if self._browser is browser:
+            self._connected = False
+            self._page = None
+
+    @staticmethod
+    async def _close_page(page: Page) -> None:
+        """Close a page (crashed pages stay open until closed), ignoring errors."""
+        try:
+            if not page.is_closed():
+                await page.close()
+        except Exception:
+            pass  # Ignore errors during cleanup
+
+    @staticmethod
+    async def _close_context(context: BrowserContext) -> None:
+        """Close a context, ignoring errors from an already-dead browser."""
+        try:
+            await context.close()
+        except Exception:
+            pass  # Ignore errors during cleanup
+
     async def get_page(self) -> Page:
         """
         Get the current page, initializing browser if needed.
@@ -106,14 +372,26 @@ class BrowserManager:
             await self._cleanup_browser()
 
             # Reset state
+            self._playwright = None
             self._browser = None
+            self._connected = False
+            self._context = None
+            self._isolated_context = None
             self._page = None
+            self._retired_page = None
+            self._loaded = None
+            self._pool = None
+            self._ready = None
 
         # Initialize new browser
         return await self.ensure_browser()
 
     async def _cleanup_browser(self) -> None:
         """Internal method to clean up browser resources."""
+        if self._refill_task and not self._refill_task.done():
+            self._refill_task.cancel()
+        self._refill_task = None
+
         try:
             if self._page and not self._page.is_closed():
                 await self._page.close()
@@ -143,7 +421,42 @@ class BrowserManager:
             # Reset all state
             self._playwright = None
             self._browser = None
+            self._connected = False
+            self._context = None
+            self._isolated_context = None
             self._page = None
+            self._retired_page = None
+            self._loaded = None
+            self._pool = None
+            self._ready = None
+
+    async def __aenter__(self) -> 'BrowserManager':
+        """
+        Enter a browser lifetime scope and start warming the browser up.
+
+        Scopes are reference counted: the MCP lifespan is entered once per
+        client session, and the browser is only released when the last
+        scope exits.
+
+        Returns:
+            BrowserManager: The singleton instance
+        """
+        self._users += 1
+        self.warm_up()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """
+        Leave a browser lifetime scope, cleaning up when it was the last one.
+
+        On server shutdown the scope exits inside a cancelled task group, so
+        cleanup runs shielded from cancellation; otherwise its first await
+        would be cancelled and the browser process left running.
+        """
+        self._users -= 1
+        if self._users == 0:
+            with anyio.CancelScope(shield=True):
+                await self.cleanup()
 
     def is_initialized(self) -> bool:
         """
@@ -152,12 +465,7 @@ class BrowserManager:
         Returns:
             bool: True if browser is ready, False otherwise
         """
-        return (
-            self._browser is not None
-            and self._browser.is_connected()
-            and self._page is not None
-            and not self._page.is_closed()
-        )
+        return self._connected and self._page is not None
 
     async def get_current_url(self) -> Optional[str]:
         """
@@ -170,20 +478,11 @@ class BrowserManager:
             return self._page.url
         return None
 
-    async def get_viewport_size(self) -> dict:
+    def get_viewport_size(self) -> dict:
         """
         Get current viewport size.
 
         Returns:
             dict: Viewport dimensions with 'width' and 'height' keys
         """
-        if self.is_initialized() and self._page:
-            viewport = self._page.viewport_size
-            return {
-                'width': viewport['width'],
-                'height': viewport['height'],
-            }
-        return {
-            'width': self._viewport_width,
-            'height': self._viewport_height,
-        }
+        return dict(self._viewport)
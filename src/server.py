@@ -1,21 +1,24 @@
 """Main MCP server with 6 browser automation tools using mcp-use framework."""
 
 import asyncio
+import functools
 import os
-import signal
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import AsyncIterator, Literal
 
 from dotenv import load_dotenv
 from mcp_use.server import MCPServer
 from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 
-from browser_manager import BrowserManager
-
-# Load environment variables
+# Load environment variables before BrowserManager reads its config at import
 load_dotenv()
 
+from browser_manager import BrowserManager
+
 # Configuration
 DEBUG = os.getenv("DEBUG", "true").lower() == "true"
 HOST = os.getenv("HOST", "0.0.0.0")
@@ -24,6 +27,8 @@ NAVIGATION_TIMEOUT = int(os.getenv("NAVIGATION_TIMEOUT", "30000"))
 ELEMENT_TIMEOUT = int(os.getenv("ELEMENT_TIMEOUT", "10000"))
 SCREENSHOT_TIMEOUT = int(os.getenv("SCREENSHOT_TIMEOUT", "5000"))
 SCREENSHOT_DIR = os.getenv("SCREENSHOT_DIR", "./screenshots")
+SCREENSHOT_QUALITY = int(os.getenv("SCREENSHOT_QUALITY", "80"))
+IO_WORKERS = int(os.getenv("IO_WORKERS", "4"))
 
 # Initialize MCP server
 server = MCPServer(
@@ -40,8 +45,61 @@ server = MCPServer(
 # Initialize browser manager
 browser_manager = BrowserManager()
 
+# Bounded pool for blocking file IO; asyncio.to_thread runs on the loop's default executor
+io_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="pw-io")
+
+
+@asynccontextmanager
+async def lifespan(_server) -> AsyncIterator[dict]:
+    """
+    MCP lifespan: keep the browser alive for as long as a client is connected.
+
+    Runs inside the server's event loop, so the browser is always cleaned up
+    by the loop that owns it. Also installs the bounded IO executor as the
+    loop's default so screenshot file operations reuse a few warm threads.
+
+    Yields:
+        dict: Lifespan context exposing the browser manager
+    """
+    asyncio.get_running_loop().set_default_executor(io_executor)
+    async with browser_manager:
+        yield {"browser": browser_manager}
+
+
+server._mcp_server.lifespan = lifespan
+
 
 # Error handling utilities
+_TIMEOUT_ERROR = ("TimeoutError", "Operation timed out. Try increasing timeout or check if site is accessible")
+
+# Checked in order against the lowered message; the first entry with a matching substring wins
+_ERROR_CLASSIFICATION = (
+    (("net::err_name_not_resolved", "dns"),
+     ("NetworkError", "DNS lookup failed. Check URL spelling and internet connection")),
+    (("net::err_connection_refused",),
+     ("NetworkError", "Connection refused. The server may be down or unreachable")),
+    (("ssl", "certificate"),
+     ("NetworkError", "SSL certificate error. The site may have security issues")),
+    (("timeout",),
+     _TIMEOUT_ERROR),
+    (("element is not visible",),
+     ("ElementNotFound", "Element exists but not visible. Try scrolling or waiting for it to appear")),
+    (("unable to find element", "no element found"),
+     ("ElementNotFound", "Element not found with given selector. Check selector syntax")),
+    (("element is disabled", "readonly"),
+     ("InvalidElementState", "Element is disabled or read-only and cannot be modified")),
+)
+
+# Flattened to (substring, classification) pairs so lookup is a single loop
+_ERROR_NEEDLES = tuple(
+    (needle, classification)
+    for needles, classification in _ERROR_CLASSIFICATION
+    for needle in needles
+)
+
+_UNKNOWN_ERROR = ("UnknownError", "An unexpected error occurred. Check the error message for details")
+
+
 def parse_playwright_error(error: Exception) -> tuple[str, str]:
     """
     Parse Playwright errors into user-friendly error types and suggestions.
@@ -52,30 +110,16 @@ def parse_playwright_error(error: Exception) -> tuple[str, str]:
     Returns:
         tuple[str, str]: (error_type, suggestion)
     """
-    error_msg = str(error).lower()
-
-    if "net::err_name_not_resolved" in error_msg or "dns" in error_msg:
-        return "NetworkError", "DNS lookup failed. Check URL spelling and internet connection"
-
-    if "net::err_connection_refused" in error_msg:
-        return "NetworkError", "Connection refused. The server may be down or unreachable"
-
-    if "ssl" in error_msg or "certificate" in error_msg:
-        return "NetworkError", "SSL certificate error. The site may have security issues"
-
-    if "timeout" in error_msg or isinstance(error, (TimeoutError, PlaywrightTimeoutError)):
-        return "TimeoutError", "Operation timed out. Try increasing timeout or check if site is accessible"
+    if isinstance(error, (TimeoutError, PlaywrightTimeoutError)):
+        return _TIMEOUT_ERROR
 
-    if "element is not visible" in error_msg:
-        return "ElementNotFound", "Element exists but not visible. Try scrolling or waiting for it to appear"
-
-    if "unable to find element" in error_msg or "no element found" in error_msg:
-        return "ElementNotFound", "Element not found with given selector. Check selector syntax"
-
-    if "element is disabled" in error_msg or "readonly" in error_msg:
-        return "InvalidElementState", "Element is disabled or read-only and cannot be modified"
+    # Plain substring checks: each is a single linear scan, unlike regex lookaheads
+    error_msg = str(error).lower()
+    for needle, classification in _ERROR_NEEDLES:
+        if needle in error_msg:
+            return classification
 
-    return "UnknownError", "An unexpected error occurred. Check the error message for details"
+    return _UNKNOWN_ERROR
 
 
 def create_error_response(
@@ -105,50 +149,113 @@ def create_error_response(
     }
 
 
+# Short timeout for optional post-click reads of an element that may be gone (ms)
+_CLICK_TEXT_TIMEOUT = 500
+
+# Validation constants
+_SCREENSHOT_TYPES = MappingProxyType({
+    ".png": "png",
+    ".jpg": "jpeg",
+    ".jpeg": "jpeg",
+    ".webp": "webp",
+})
+
+# Invariant validation errors; tools copy them and add per-call context fields
+_INVALID_URL_ERROR = MappingProxyType(create_error_response(
+    "ValidationError",
+    "URL must start with http:// or https://",
+    "Add http:// or https:// to the URL",
+))
+_EMPTY_SELECTOR_ERROR = MappingProxyType(create_error_response(
+    "ValidationError",
+    "Selector cannot be empty",
+    "Provide a valid CSS selector",
+))
+_EMPTY_PATH_ERROR = MappingProxyType(create_error_response(
+    "ValidationError",
+    "Path cannot be empty",
+    "Provide a valid file path",
+))
+
+
+def validate_selector(tool):
+    """
+    Reject empty CSS selectors before the tool body runs.
+
+    Apply below @server.tool() so the registered tool includes the check.
+
+    Args:
+        tool: Tool coroutine whose first parameter is the selector
+
+    Returns:
+        The wrapped tool, returning a ValidationError response for blank selectors
+    """
+    @functools.wraps(tool)
+    async def wrapper(selector: str, *args, **kwargs) -> dict:
+        if not selector or not selector.strip():
+            return {**_EMPTY_SELECTOR_ERROR, "selector": selector}
+        return await tool(selector, *args, **kwargs)
+
+    return wrapper
+
+
 # Tool implementations
 @server.tool()
-async def navigate(url: str, wait_until: str = "load") -> dict:
+async def navigate(
+    url: str,
+    wait_until: Literal["load", "domcontentloaded", "networkidle"] = "load",
+    force: bool = False,
+    isolated: bool = False,
+    include_title: bool = True,
+) -> dict:
     """
     Navigate to a URL in the browser.
 
+    If the last navigation on the current page loaded exactly this URL (and
+    waited at least as long), it is skipped and the current page is reported.
+    A failed or timed-out navigation is always retried. "networkidle" always
+    navigates.
+
     Args:
         url: The URL to navigate to (must start with http:// or https://)
         wait_until: When to consider navigation complete. Options:
                    - "load": Wait for the load event (default)
                    - "domcontentloaded": Wait for DOMContentLoaded event
                    - "networkidle": Wait until network is idle
+        force: If True, always navigate, reloading the page when already at the URL
+        isolated: If True, first replace the page with one in a fresh browser context
+                  (no cookies, cache or storage shared with earlier pages)
+        include_title: If False, skip reading the page title (returned as None)
 
     Returns:
-        dict: Success status with URL and title, or error details
+        dict: Success status with URL, title and HTTP status, or error details.
+              status is None when no navigation happened (same-URL fast path)
     """
     try:
         # Validation
         if not url.startswith(("http://", "https://")):
-            return create_error_response(
-                "ValidationError",
-                "URL must start with http:// or https://",
-                "Add http:// or https:// to the URL",
-                url=url
-            )
-
-        if wait_until not in ["load", "domcontentloaded", "networkidle"]:
-            return create_error_response(
-                "ValidationError",
-                f"Invalid wait_until value: {wait_until}",
-                "Use 'load', 'domcontentloaded', or 'networkidle'",
-                url=url
-            )
+            return {**_INVALID_URL_ERROR, "url": url}
 
         # Execution
-        page = await browser_manager.get_page()
-        await page.goto(url, wait_until=wait_until, timeout=NAVIGATION_TIMEOUT)
-
-        # Success response
-        return {
-            "success": True,
-            "url": page.url,
-            "title": await page.title()
-        }
+        async with browser_manager.acquire() as page:
+            # Swap pages under the page lock, so no other tool call is using the old one
+            if isolated:
+                page = await browser_manager.isolate_locked()
+
+            # Same-URL fast path: only after a navigation to url completed on this page
+            response = None
+            if force or not browser_manager.has_loaded(page, url, wait_until):
+                browser_manager.forget_navigation()
+                response = await page.goto(url, wait_until=wait_until, timeout=NAVIGATION_TIMEOUT)
+                browser_manager.record_navigation(page, url, wait_until)
+
+            # Success response
+            return {
+                "success": True,
+                "url": page.url,
+                "title": await page.title() if include_title else None,
+                "status": response.status if response else None
+            }
 
     except PlaywrightTimeoutError:
         return create_error_response(
@@ -163,40 +270,41 @@ async def navigate(url: str, wait_until: str = "load") -> dict:
 
 
 @server.tool()
-async def click_element(selector: str) -> dict:
+@validate_selector
+async def click_element(selector: str, return_text: bool = False) -> dict:
     """
     Click an element by CSS selector.
 
     Args:
         selector: CSS selector of the element to click
+        return_text: If True, also return the element's text (best effort;
+                     None if the element is gone after the click)
 
     Returns:
         dict: Success status with element details, or error details
     """
     try:
-        # Validation
-        if not selector or not selector.strip():
-            return create_error_response(
-                "ValidationError",
-                "Selector cannot be empty",
-                "Provide a valid CSS selector",
-                selector=selector
-            )
-
         # Execution
-        page = await browser_manager.get_page()
-        element = page.locator(selector)
+        async with browser_manager.acquire() as page:
+            element = page.locator(selector)
+
+            # Wait for element and click
+            await element.click(timeout=ELEMENT_TIMEOUT)
 
-        # Wait for element and click
-        await element.click(timeout=ELEMENT_TIMEOUT)
+            if not return_text:
+                return {"success": True, "selector": selector}
 
-        # Get element text for confirmation
-        element_text = await element.text_content()
+            # Best-effort confirmation text; the click may have navigated away
+            try:
+                element_text = await element.text_content(timeout=_CLICK_TEXT_TIMEOUT)
+                element_text = element_text.strip() if element_text else ""
+            except PlaywrightError:
+                element_text = None
 
         return {
             "success": True,
             "selector": selector,
-            "element_text": element_text.strip() if element_text else ""
+            "element_text": element_text
         }
 
     except PlaywrightTimeoutError:
@@ -212,34 +320,29 @@ async def click_element(selector: str) -> dict:
 
 
 @server.tool()
-async def fill_input(selector: str, text: str) -> dict:
+@validate_selector
+async def fill_input(selector: str, text: str, clear_first: bool = False) -> dict:
     """
     Fill a form input with text.
 
     Args:
         selector: CSS selector of the input element
-        text: Text to fill into the input
+        text: Text to fill into the input (replaces any existing value)
+        clear_first: If True, explicitly clear the element before filling
+                     (fill already clears inputs; useful for custom editors)
 
     Returns:
         dict: Success status with input details, or error details
     """
     try:
-        # Validation
-        if not selector or not selector.strip():
-            return create_error_response(
-                "ValidationError",
-                "Selector cannot be empty",
-                "Provide a valid CSS selector",
-                selector=selector
-            )
-
         # Execution
-        page = await browser_manager.get_page()
-        element = page.locator(selector)
+        async with browser_manager.acquire() as page:
+            element = page.locator(selector)
 
-        # Clear and fill
-        await element.clear(timeout=ELEMENT_TIMEOUT)
-        await element.fill(text, timeout=ELEMENT_TIMEOUT)
+            # fill() replaces the current value, so clearing is opt-in
+            if clear_first:
+                await element.clear(timeout=ELEMENT_TIMEOUT)
+            await element.fill(text, timeout=ELEMENT_TIMEOUT)
 
         return {
             "success": True,
@@ -260,10 +363,15 @@ async def fill_input(selector: str, text: str) -> dict:
 
 
 @server.tool()
+@validate_selector
 async def extract_text(selector: str) -> dict:
     """
     Extract text content from an element.
 
+    The element only needs to be attached to the DOM, so text of hidden
+    elements can be read. If the selector matches several elements, the
+    first one is used.
+
     Args:
         selector: CSS selector of the element
 
@@ -271,28 +379,19 @@ async def extract_text(selector: str) -> dict:
         dict: Success status with extracted text, or error details
     """
     try:
-        # Validation
-        if not selector or not selector.strip():
-            return create_error_response(
-                "ValidationError",
-                "Selector cannot be empty",
-                "Provide a valid CSS selector",
-                selector=selector
-            )
-
         # Execution
-        page = await browser_manager.get_page()
-        element = page.locator(selector)
+        async with browser_manager.acquire() as page:
+            element = page.locator(selector).first
 
-        # Wait for element and get text
-        await element.wait_for(timeout=ELEMENT_TIMEOUT)
-        text = await element.text_content()
+            # text_content waits for the element to be attached
+            text = await element.text_content(timeout=ELEMENT_TIMEOUT)
 
+        text = text.strip() if text else ""
         return {
             "success": True,
             "selector": selector,
-            "text": text.strip() if text else "",
-            "text_length": len(text.strip()) if text else 0
+            "text": text,
+            "text_length": len(text)
         }
 
     except PlaywrightTimeoutError:
@@ -308,58 +407,59 @@ async def extract_text(selector: str) -> dict:
 
 
 @server.tool()
-async def screenshot(path: str, full_page: bool = False) -> dict:
+async def screenshot(path: str, full_page: bool = False, omit_background: bool = False) -> dict:
     """
     Take a screenshot of the current page.
 
+    The format follows the file extension. JPEG and WebP are lossy and
+    compressed with SCREENSHOT_QUALITY, typically several times smaller
+    than PNG for full-page captures.
+
     Args:
-        path: File path to save the screenshot (supports .png, .jpg, .jpeg)
+        path: File path to save the screenshot (supports .png, .jpg, .jpeg, .webp)
         full_page: If True, captures the entire scrollable page. If False, captures viewport only
+        omit_background: If True, capture a transparent instead of white default
+                         background (PNG and WebP only)
 
     Returns:
         dict: Success status with file details, or error details
     """
     try:
-        # Validation
-        if not path or not path.strip():
-            return create_error_response(
-                "ValidationError",
-                "Path cannot be empty",
-                "Provide a valid file path",
-                path=path
-            )
-
-        # Validate file extension
-        valid_extensions = ['.png', '.jpg', '.jpeg']
-        path_obj = Path(path)
-        if path_obj.suffix.lower() not in valid_extensions:
+        # Validation: one lookup covers both empty paths and bad extensions
+        stripped = path.strip()
+        path_obj = Path(stripped)
+        image_type = _SCREENSHOT_TYPES.get(path_obj.suffix.lower())
+        if image_type is None:
+            if not stripped:
+                return {**_EMPTY_PATH_ERROR, "path": path}
             return create_error_response(
                 "ValidationError",
                 f"Invalid file extension: {path_obj.suffix}",
-                f"Use one of: {', '.join(valid_extensions)}",
+                f"Use one of: {', '.join(_SCREENSHOT_TYPES)}",
                 path=path
             )
 
-        # Create parent directories
-        path_obj.parent.mkdir(parents=True, exist_ok=True)
+        # JPEG and WebP take a quality setting; PNG and WebP support transparency
+        options = {"type": image_type, "full_page": full_page, "timeout": SCREENSHOT_TIMEOUT}
+        if image_type != "png":
+            options["quality"] = SCREENSHOT_QUALITY
+        if image_type != "jpeg":
+            options["omit_background"] = omit_background
 
-        # Execution
-        page = await browser_manager.get_page()
-        await page.screenshot(
-            path=path,
-            full_page=full_page,
-            timeout=SCREENSHOT_TIMEOUT
-        )
+        # Execution: create parent directories off the event loop, then capture
+        await asyncio.to_thread(path_obj.parent.mkdir, parents=True, exist_ok=True)
+        async with browser_manager.acquire() as page:
+            image = await page.screenshot(**options)
 
-        # Get file info
-        absolute_path = path_obj.resolve()
-        file_size = absolute_path.stat().st_size
-        viewport = await browser_manager.get_viewport_size()
+        # Write the captured bytes without blocking the event loop
+        await asyncio.to_thread(path_obj.write_bytes, image)
+        absolute_path = await asyncio.to_thread(path_obj.resolve)
+        viewport = browser_manager.get_viewport_size()
 
         return {
             "success": True,
             "path": str(absolute_path),
-            "file_size": file_size,
+            "file_size": len(image),
             "full_page": full_page,
             "viewport": viewport
         }
@@ -393,11 +493,10 @@ async def get_page_info() -> dict:
     """
     try:
         # Execution (auto-initializes browser if needed)
-        page = await browser_manager.get_page()
-
-        url = page.url
-        title = await page.title()
-        viewport = await browser_manager.get_viewport_size()
+        async with browser_manager.acquire() as page:
+            url = page.url
+            title = await page.title()
+            viewport = browser_manager.get_viewport_size()
 
         return {
             "success": True,
@@ -411,38 +510,9 @@ async def get_page_info() -> dict:
         return create_error_response(error_type, str(e), suggestion)
 
 
-# Shutdown handler
-async def shutdown(signal_name: Optional[str] = None) -> None:
-    """
-    Graceful shutdown handler.
-
-    Args:
-        signal_name: Name of the signal that triggered shutdown
-    """
-    if signal_name:
-        print(f"\nReceived {signal_name}, shutting down gracefully...")
-    else:
-        print("\nShutting down gracefully...")
-
-    await browser_manager.cleanup()
-    print("Browser cleanup complete")
-
-
-def setup_signal_handlers() -> None:
-    """Setup signal handlers for graceful shutdown."""
-    def signal_handler(signum, frame):
-        signal_name = signal.Signals(signum).name
-        asyncio.create_task(shutdown(signal_name))
-
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-
-
 # Main entry point
 if __name__ == "__main__":
     try:
-        setup_signal_handlers()
-
         # Print user-friendly URLs with localhost (not 0.0.0.0)
         print("\n" + "="*60)
         print("🚀 Playwright Automation Server v1.0.0")
@@ -468,6 +538,3 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Fatal error: {e}", file=sys.stderr)
         sys.exit(1)
-    finally:
-        # Ensure cleanup happens
-        asyncio.run(shutdown())
@@ -0,0 +1,117 @@
+"""Shared fixtures for Playwright MCP Server tests."""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from dotenv import load_dotenv
+
+# Load environment before BrowserManager reads its configuration at class
+# definition; an explicit path skips the .env search. server.py loads .env
+# again when the tests import it (existing variables are not overridden).
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+# Tests only read text and take small screenshots; skip image decoding
+os.environ.setdefault("HEADLESS", "true")
+os.environ.setdefault("DISABLE_IMAGES", "true")
+
+from browser_manager import BrowserManager
+
+# Created once at import; fixtures hand out this instance
+_MANAGER = BrowserManager.instance()
+
+
+# Local stand-in for https://example.com, so tests never leave the machine
+EXAMPLE_PAGE = b"""<!doctype html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Example Domain</title>
+</head>
+<body>
+    <h1>Example Domain</h1>
+    <p>This domain is for use in illustrative examples in documents.</p>
+    <p class="note">First note</p>
+    <p class="note">Second note</p>
+    <p id="hidden" style="display: none">Hidden text</p>
+    <button id="greet">Say hello</button>
+    <button id="dismiss" onclick="this.remove()">Dismiss</button>
+    <input id="name" value="Preset value">
+</body>
+</html>
+"""
+
+
+class _ExamplePageHandler(BaseHTTPRequestHandler):
+    """Serve EXAMPLE_PAGE for every GET request."""
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(EXAMPLE_PAGE)))
+        self.end_headers()
+        self.wfile.write(EXAMPLE_PAGE)
+
+    def log_message(self, format, *args) -> None:
+        pass  # Keep test output quiet
+
+
+def pytest_collection_modifyitems(items):
+    """Run tests marked serial (they tear the shared browser down) after all others."""
+    items.sort(key=lambda item: item.get_closest_marker("serial") is not None)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def session_manager():
+    """
+    Browser manager shared by the whole test session.
+
+    Chromium is launched once instead of once per test, and the launch
+    starts in the background as soon as the fixture is set up, overlapping
+    with the setup of the first test. Per-test fixtures reset the page they
+    need rather than restarting the browser.
+    """
+    _MANAGER.warm_up()
+    yield _MANAGER
+    await _MANAGER.cleanup()
+
+
+@pytest_asyncio.fixture
+async def manager(session_manager, base_url):
+    """Shared browser manager with its active page on the example page."""
+    page = await session_manager.get_page()
+    await page.goto(f"{base_url}/", wait_until="domcontentloaded")
+    yield session_manager
+
+
+@pytest_asyncio.fixture
+async def page(session_manager):
+    """Fresh page in the shared context, owned by one test and closed after it."""
+    page = await session_manager.new_page()
+    yield page
+    await page.close()
+
+
+@pytest.fixture(scope="session")
+def screenshot_dir(tmp_path_factory):
+    """Directory for screenshots, created once per session (per xdist worker)."""
+    return tmp_path_factory.mktemp("shots", numbered=False)
+
+
+@pytest.fixture(scope="session")
+def base_url():
+    """
+    Base URL of a local HTTP server serving a copy of example.com.
+
+    Binds an ephemeral port on 127.0.0.1, so page loads skip DNS, TLS and
+    the round trip to the real site.
+    """
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ExamplePageHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,56 @@
+"""Unit tests for the server's error handling utilities."""
+
+from server import create_error_response, parse_playwright_error
+
+
+class TestErrorHandling:
+    """Test suite for error handling utilities."""
+
+    def test_parse_playwright_error_dns(self):
+        """Test parsing DNS errors."""
+        error = Exception("net::ERR_NAME_NOT_RESOLVED")
+        error_type, suggestion = parse_playwright_error(error)
+        assert error_type == "NetworkError", "Should be NetworkError"
+        assert "DNS" in suggestion, "Suggestion should mention DNS"
+
+    def test_parse_playwright_error_case_insensitive(self):
+        """Test that classification ignores the case of the message."""
+        error = Exception("Net::ERR_NAME_NOT_RESOLVED at https://example.com")
+        error_type, _ = parse_playwright_error(error)
+        assert error_type == "NetworkError", "Should match regardless of case"
+
+        error = Exception("SSL handshake failed")
+        error_type, suggestion = parse_playwright_error(error)
+        assert "SSL" in suggestion, "Suggestion should mention SSL"
+
+    def test_parse_playwright_error_timeout(self):
+        """Test parsing timeout errors."""
+        error = TimeoutError("Operation timed out")
+        error_type, suggestion = parse_playwright_error(error)
+        assert error_type == "TimeoutError", "Should be TimeoutError"
+        assert "timeout" in suggestion.lower(), "Suggestion should mention timeout"
+
+    def test_parse_playwright_error_priority(self):
+        """Test that earlier classifications win regardless of position in the message."""
+        error = Exception("Element is not visible\nTimeout 10000ms exceeded")
+        error_type, _ = parse_playwright_error(error)
+        assert error_type == "TimeoutError", "Timeout should take priority over visibility"
+
+        error = Exception("Something else went wrong")
+        error_type, _ = parse_playwright_error(error)
+        assert error_type == "UnknownError", "Unmatched messages should be UnknownError"
+
+    def test_create_error_response(self):
+        """Test error response creation."""
+        result = create_error_response(
+            "ValidationError",
+            "Invalid input",
+            "Check your input",
+            url="https://example.com"
+        )
+
+        assert result["success"] is False, "Should have success=False"
+        assert result["error_type"] == "ValidationError", "Should have correct error_type"
+        assert result["error"] == "Invalid input", "Should have error message"
+        assert result["suggestion"] == "Check your input", "Should have suggestion"
+        assert result["url"] == "https://example.com", "Should include extra kwargs"
@@ -3,30 +3,34 @@
 import asyncio
 import os
 from pathlib import Path
+from types import SimpleNamespace
 
+import anyio
 import pytest
-from dotenv import load_dotenv
-
-# Load environment before importing modules
-load_dotenv()
-
-# Import after loading env
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import pytest_asyncio
 
 from browser_manager import BrowserManager
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from server import (
+    click_element,
+    extract_text,
+    fill_input,
+    get_page_info,
+    lifespan,
+    navigate,
+    screenshot,
+    server,
+)
 
 
 class TestBrowserManager:
     """Test suite for BrowserManager singleton."""
 
-    @pytest.fixture
-    async def manager(self):
-        """Fixture to provide a fresh browser manager."""
-        manager = BrowserManager()
-        yield manager
-        # Cleanup after test
-        await manager.cleanup()
+    @pytest_asyncio.fixture
+    async def isolated_manager(self, session_manager):
+        """Fixture for tests that tear the browser down; the next test relaunches it."""
+        yield session_manager
+        await session_manager.cleanup()
 
     @pytest.mark.asyncio
     async def test_singleton_pattern(self):
@@ -34,6 +38,31 @@ class TestBrowserManager:
         manager1 = BrowserManager()
         manager2 = BrowserManager()
         assert manager1 is manager2, "BrowserManager should be a singleton"
+        assert BrowserManager.instance() is manager1, "instance() should return the singleton"
+
+    @pytest.mark.asyncio
+    async def test_acquire_serializes_callers(self, monkeypatch):
+        """Test that concurrent acquire() blocks run one after the other."""
+        manager = BrowserManager.instance()
+        page = object()
+
+        async def ensure_browser():
+            return page
+
+        monkeypatch.setattr(manager, "ensure_browser", ensure_browser)
+        events = []
+
+        async def tool_call(name):
+            async with manager.acquire() as acquired:
+                assert acquired is page, "Should yield the active page"
+                events.append(f"{name} start")
+                await asyncio.sleep(0.01)
+                events.append(f"{name} end")
+
+        await asyncio.gather(tool_call("first"), tool_call("second"))
+        assert events == ["first start", "first end", "second start", "second end"], (
+            "Second call should wait for the first to finish"
+        )
 
     @pytest.mark.asyncio
     async def test_browser_initialization(self, manager):
@@ -43,119 +72,303 @@ class TestBrowserManager:
         assert manager.is_initialized(), "Manager should report as initialized"
 
     @pytest.mark.asyncio
-    async def test_get_current_url(self, manager):
+    async def test_get_current_url(self, manager, base_url):
         """Test getting current URL."""
         page = await manager.get_page()
-        await page.goto("https://example.com")
+        await page.goto(f"{base_url}/other", wait_until="domcontentloaded")
+        url = await manager.get_current_url()
+        assert url == f"{base_url}/other", "Should return current URL"
+
+    @pytest.mark.asyncio
+    async def test_new_page(self, manager, page, base_url):
+        """Test that new_page opens a separate page in the shared context."""
+        active = await manager.get_page()
+        assert page is not active, "Should not hand out the active page"
+        assert page.context is active.context, "Should share the active page's context"
+
+        await page.goto(f"{base_url}/other", wait_until="domcontentloaded")
         url = await manager.get_current_url()
-        assert url == "https://example.com/", "Should return current URL"
+        assert url == f"{base_url}/", "Active page should be unaffected"
 
     @pytest.mark.asyncio
     async def test_get_viewport_size(self, manager):
         """Test getting viewport size."""
         await manager.get_page()
-        viewport = await manager.get_viewport_size()
+        viewport = manager.get_viewport_size()
         assert "width" in viewport, "Viewport should have width"
         assert "height" in viewport, "Viewport should have height"
         assert viewport["width"] > 0, "Width should be positive"
         assert viewport["height"] > 0, "Height should be positive"
 
+    @pytest.mark.serial
     @pytest.mark.asyncio
-    async def test_cleanup(self, manager):
+    async def test_cleanup(self, isolated_manager):
         """Test cleanup releases resources."""
-        await manager.get_page()
-        assert manager.is_initialized(), "Should be initialized before cleanup"
+        await isolated_manager.get_page()
+        assert isolated_manager.is_initialized(), "Should be initialized before cleanup"
 
-        await manager.cleanup()
-        assert not manager.is_initialized(), "Should not be initialized after cleanup"
+        await isolated_manager.cleanup()
+        assert not isolated_manager.is_initialized(), "Should not be initialized after cleanup"
 
+    @pytest.mark.serial
     @pytest.mark.asyncio
-    async def test_restart_browser(self, manager):
+    async def test_restart_browser(self, isolated_manager, base_url):
         """Test browser restart functionality."""
-        page1 = await manager.get_page()
-        await page1.goto("https://example.com")
+        page1 = await isolated_manager.get_page()
+        await page1.goto(f"{base_url}/", wait_until="domcontentloaded")
 
         # Restart browser
-        page2 = await manager.restart_browser()
+        page2 = await isolated_manager.restart_browser()
         assert page2 is not None, "Should return new page after restart"
-        assert manager.is_initialized(), "Should be initialized after restart"
+        assert isolated_manager.is_initialized(), "Should be initialized after restart"
 
         # URL should be reset to about:blank
-        url = await manager.get_current_url()
+        url = await isolated_manager.get_current_url()
         assert url in ["about:blank", ""], "New browser should start at blank page"
 
 
+def _image_format(data: bytes):
+    """Identify an image format from its magic bytes."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if data.startswith(b"\xff\xd8"):
+        return "jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+class _FakePage:
+    """Stand-in for a Playwright page that records navigations."""
+
+    def __init__(self):
+        self.url = "about:blank"
+        self.gotos = []
+        self.fail_next = None
+
+    async def goto(self, url, **kwargs):
+        self.gotos.append(url)
+        self.url = url  # Like Playwright, the URL changes once navigation commits
+        if self.fail_next is not None:
+            error, self.fail_next = self.fail_next, None
+            raise error
+        return SimpleNamespace(status=200)
+
+    async def title(self):
+        return "Fake"
+
+
+class TestLifespan:
+    """Test suite for the MCP lifespan; the browser itself is never launched."""
+
+    @pytest.fixture
+    def cleanups(self, monkeypatch):
+        """Record cleanup calls instead of closing a browser, and skip warm-up."""
+        calls = []
+
+        async def cleanup():
+            await asyncio.sleep(0)  # A cancelled, unshielded scope fails here
+            calls.append(True)
+
+        manager = BrowserManager.instance()
+        monkeypatch.setattr(manager, "warm_up", lambda: None)
+        monkeypatch.setattr(manager, "cleanup", cleanup)
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_cleanup_after_last_session(self, cleanups):
+        """Test that the browser is only cleaned up when the last session ends."""
+        first, second = lifespan(server), lifespan(server)
+        await first.__aenter__()
+        await second.__aenter__()
+
+        await first.__aexit__(None, None, None)
+        assert cleanups == [], "Should keep the browser while a session remains"
+
+        await second.__aexit__(None, None, None)
+        assert cleanups == [True], "Should clean up after the last session"
+
+    @pytest.mark.asyncio
+    async def test_cleanup_survives_cancellation(self, cleanups):
+        """Test that cleanup completes when the session task group is cancelled."""
+        async def session():
+            async with lifespan(server):
+                await anyio.sleep_forever()
+
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(session)
+            await anyio.sleep(0)
+            task_group.cancel_scope.cancel()
+
+        assert cleanups == [True], "Cleanup should run despite cancellation"
+
+
 class TestNavigateTool:
     """Test suite for navigate tool."""
 
     @pytest.fixture
-    async def manager(self):
-        """Fixture to provide a fresh browser manager."""
-        # Import here to avoid issues
-        from browser_manager import BrowserManager
-        manager = BrowserManager()
-        yield manager
-        await manager.cleanup()
+    def fake_page(self, monkeypatch):
+        """Serve a fake page from the browser manager, so no browser is launched."""
+        page = _FakePage()
+        manager = BrowserManager.instance()
+
+        async def ensure_browser():
+            return page
+
+        monkeypatch.setattr(manager, "ensure_browser", ensure_browser)
+        yield page
+        manager.forget_navigation()
+
+    @pytest_asyncio.fixture
+    async def shared_context(self, manager):
+        """Context shared by pooled pages; afterwards, return to it and drop cookies."""
+        page = await manager.get_page()
+        yield page.context
+        await page.context.clear_cookies()
+        # Closing the isolated active page swaps in a pooled page from the shared context
+        await (await manager.get_page()).close()
 
     @pytest.mark.asyncio
-    async def test_navigate_valid_url(self, manager):
-        """Test navigation to valid URL."""
-        from server import navigate
+    async def test_navigate_isolated(self, manager, shared_context, base_url):
+        """Test that isolated navigation uses a fresh context and closes the previous one."""
+        await shared_context.add_cookies([{"name": "token", "value": "1", "url": base_url}])
+
+        result = await navigate(f"{base_url}/isolated", isolated=True)
+        assert result["success"] is True, "Isolated navigation should succeed"
+
+        first = await manager.get_page()
+        assert first.context is not shared_context, "Should use a new context"
+        assert await first.context.cookies() == [], "Should not see the shared cookies"
+
+        await navigate(f"{base_url}/isolated", isolated=True)
+        second = await manager.get_page()
+        assert second.context is not first.context, "Should use another new context"
+        assert first.is_closed(), "Previous isolated page should be closed"
+        assert first.context not in second.context.browser.contexts, (
+            "Previous isolated context should be closed"
+        )
 
-        result = await navigate("https://example.com")
+    @pytest.mark.asyncio
+    async def test_navigate_without_title(self, session_manager, base_url):
+        """Test that include_title=False skips the title but still reports the status."""
+        result = await navigate(f"{base_url}/untitled", include_title=False)
         assert result["success"] is True, "Navigation should succeed"
-        assert "url" in result, "Result should contain URL"
-        assert "title" in result, "Result should contain title"
-        assert "example.com" in result["url"].lower(), "Should navigate to example.com"
+        assert result["title"] is None, "Title should be None when not requested"
+        assert result["status"] == 200, "Should report the HTTP status"
 
     @pytest.mark.asyncio
-    async def test_navigate_invalid_url(self, manager):
-        """Test navigation with invalid URL (missing protocol)."""
-        from server import navigate
+    async def test_navigate_without_title_skips_lookup(self, fake_page, monkeypatch):
+        """Test that include_title=False never asks the page for its title."""
+        async def title():
+            raise AssertionError("title() should not be called")
 
-        result = await navigate("example.com")
-        assert result["success"] is False, "Should fail for URL without protocol"
-        assert result["error_type"] == "ValidationError", "Should be validation error"
-        assert "http://" in result["suggestion"], "Suggestion should mention http://"
+        monkeypatch.setattr(fake_page, "title", title)
+        result = await navigate("https://example.com/", include_title=False)
+        assert result["title"] is None, "Title should be None when not requested"
 
     @pytest.mark.asyncio
-    async def test_navigate_invalid_wait_until(self, manager):
-        """Test navigation with invalid wait_until parameter."""
-        from server import navigate
+    async def test_navigate_isolated_waits_for_tool_call(self, fake_page, monkeypatch):
+        """Test that an isolated navigate waits for an in-flight acquire() block."""
+        manager = BrowserManager.instance()
+        events = []
+
+        async def isolate_locked():
+            events.append("isolate")
+            return fake_page
+
+        monkeypatch.setattr(manager, "isolate_locked", isolate_locked)
+
+        async def tool_call():
+            async with manager.acquire():
+                events.append("tool start")
+                await asyncio.sleep(0.01)
+                events.append("tool end")
+
+        await asyncio.gather(tool_call(), navigate("https://example.com/", isolated=True))
+        assert events == ["tool start", "tool end", "isolate"], (
+            "Isolation should wait for the in-flight tool call"
+        )
 
-        result = await navigate("https://example.com", wait_until="invalid")
-        assert result["success"] is False, "Should fail for invalid wait_until"
-        assert result["error_type"] == "ValidationError", "Should be validation error"
+    @pytest.mark.asyncio
+    async def test_navigate_same_url_fast_path(self, fake_page):
+        """Test that repeating a completed navigation does not reload the page."""
+        first = await navigate("https://example.com/")
+        second = await navigate("https://example.com/")
+
+        assert first["status"] == 200, "First call should navigate"
+        assert second["success"] is True, "Repeat call should succeed"
+        assert second["status"] is None, "Repeat call should skip navigation"
+        assert fake_page.gotos == ["https://example.com/"], "Should call goto once"
+
+    @pytest.mark.asyncio
+    async def test_navigate_force_reloads(self, fake_page):
+        """Test that force=True navigates even when the URL was just loaded."""
+        await navigate("https://example.com/")
+        result = await navigate("https://example.com/", force=True)
+
+        assert result["status"] == 200, "Forced call should navigate"
+        assert len(fake_page.gotos) == 2, "Should call goto twice"
+
+    @pytest.mark.asyncio
+    async def test_navigate_retries_after_timeout(self, fake_page):
+        """Test that a timed-out navigation is not treated as loaded on retry."""
+        fake_page.fail_next = PlaywrightTimeoutError("Timeout 30000ms exceeded")
+        first = await navigate("https://example.com/")
+        second = await navigate("https://example.com/")
+
+        assert first["error_type"] == "TimeoutError", "First call should time out"
+        assert second["status"] == 200, "Retry should navigate again"
+        assert len(fake_page.gotos) == 2, "Should call goto on retry"
+
+    @pytest.mark.asyncio
+    async def test_navigate_later_load_state(self, fake_page):
+        """Test that waiting for a later load state than last time navigates again."""
+        await navigate("https://example.com/", wait_until="domcontentloaded")
+        result = await navigate("https://example.com/", wait_until="load")
+
+        assert result["status"] == 200, "Should navigate to wait for load"
+        assert len(fake_page.gotos) == 2, "Should call goto twice"
+
+    @pytest.mark.asyncio
+    async def test_navigate_valid_url(self, session_manager, base_url):
+        """Test navigation to valid URL."""
+        # A path no fixture has loaded, so the page really navigates
+        result = await navigate(f"{base_url}/nav", wait_until="domcontentloaded")
+        assert result["success"] is True, "Navigation should succeed"
+        assert "url" in result, "Result should contain URL"
+        assert "title" in result, "Result should contain title"
+        assert result["url"] == f"{base_url}/nav", "Should navigate to the example page"
+        assert result["title"] == "Example Domain", "Should report the page title"
+        assert result["status"] == 200, "Should report the HTTP status of a real navigation"
 
 
 class TestClickElement:
     """Test suite for click_element tool."""
 
-    @pytest.fixture
-    async def manager(self):
-        """Fixture to provide a fresh browser manager."""
-        from browser_manager import BrowserManager
-        manager = BrowserManager()
-        # Navigate to a test page
-        page = await manager.get_page()
-        await page.goto("https://example.com")
-        yield manager
-        await manager.cleanup()
+    @pytest.mark.asyncio
+    async def test_click_element(self, manager):
+        """Test that a plain click does not read the element's text."""
+        result = await click_element("#greet")
+        assert result["success"] is True, "Click should succeed"
+        assert "element_text" not in result, "Should not return text unless asked"
 
     @pytest.mark.asyncio
-    async def test_click_empty_selector(self, manager):
-        """Test clicking with empty selector."""
-        from server import click_element
+    async def test_click_element_return_text(self, manager):
+        """Test that return_text=True returns the clicked element's text."""
+        result = await click_element("#greet", return_text=True)
+        assert result["success"] is True, "Click should succeed"
+        assert result["element_text"] == "Say hello", "Should return the element text"
 
-        result = await click_element("")
-        assert result["success"] is False, "Should fail for empty selector"
-        assert result["error_type"] == "ValidationError", "Should be validation error"
+    @pytest.mark.asyncio
+    async def test_click_element_removed_on_click(self, manager):
+        """Test that return_text falls back to None when the click removes the element."""
+        result = await click_element("#dismiss", return_text=True)
+        assert result["success"] is True, "Click should succeed"
+        assert result["element_text"] is None, "Text should be None once the element is gone"
 
     @pytest.mark.asyncio
     async def test_click_invalid_selector(self, manager):
         """Test clicking non-existent element."""
-        from server import click_element
-
         result = await click_element("button.does-not-exist")
         assert result["success"] is False, "Should fail for non-existent element"
         assert result["error_type"] == "ElementNotFound", "Should be ElementNotFound error"
@@ -164,69 +377,53 @@ class TestClickElement:
 class TestFillInput:
     """Test suite for fill_input tool."""
 
+    @pytest.mark.parametrize("clear_first", [False, True])
     @pytest.mark.asyncio
-    async def test_fill_empty_selector(self):
-        """Test filling with empty selector."""
-        from server import fill_input
+    async def test_fill_replaces_value(self, manager, clear_first):
+        """Test that filling replaces a preset value, with or without clearing first."""
+        result = await fill_input("#name", "New value", clear_first=clear_first)
+        assert result["success"] is True, "Fill should succeed"
 
-        result = await fill_input("", "test text")
-        assert result["success"] is False, "Should fail for empty selector"
-        assert result["error_type"] == "ValidationError", "Should be validation error"
+        page = await manager.get_page()
+        value = await page.input_value("#name")
+        assert value == "New value", "Should replace the preset value"
 
 
 class TestExtractText:
     """Test suite for extract_text tool."""
 
-    @pytest.fixture
-    async def manager(self):
-        """Fixture to provide a fresh browser manager."""
-        from browser_manager import BrowserManager
-        manager = BrowserManager()
-        page = await manager.get_page()
-        await page.goto("https://example.com")
-        yield manager
-        await manager.cleanup()
-
     @pytest.mark.asyncio
-    async def test_extract_text_h1(self, manager):
-        """Test extracting text from h1 element."""
-        from server import extract_text
-
-        result = await extract_text("h1")
-        assert result["success"] is True, "Should succeed for h1 on example.com"
-        assert "text" in result, "Result should contain text"
-        assert len(result["text"]) > 0, "Text should not be empty"
+    async def test_extract_text_hidden_element(self, manager):
+        """Test that text of a hidden element can still be read."""
+        result = await extract_text("#hidden")
+        assert result["success"] is True, "Should succeed for a hidden element"
+        assert result["text"] == "Hidden text", "Should return the hidden text"
 
     @pytest.mark.asyncio
-    async def test_extract_text_empty_selector(self, manager):
-        """Test extracting with empty selector."""
-        from server import extract_text
-
-        result = await extract_text("")
-        assert result["success"] is False, "Should fail for empty selector"
-        assert result["error_type"] == "ValidationError", "Should be validation error"
+    async def test_extract_text_first_match(self, manager):
+        """Test that a selector matching several elements uses the first one."""
+        result = await extract_text(".note")
+        assert result["success"] is True, "Should succeed for several matches"
+        assert result["text"] == "First note", "Should return the first match's text"
 
 
 class TestScreenshot:
     """Test suite for screenshot tool."""
 
-    @pytest.fixture
-    async def manager(self):
-        """Fixture to provide a fresh browser manager."""
-        from browser_manager import BrowserManager
-        manager = BrowserManager()
-        page = await manager.get_page()
-        await page.goto("https://example.com")
-        yield manager
-        await manager.cleanup()
-
+    @pytest.mark.parametrize("filename,image_format,omit_background", [
+        ("test.png", "png", False),
+        ("test.jpg", "jpeg", False),
+        ("test.jpeg", "jpeg", True),
+        ("test.webp", "webp", True),
+    ])
     @pytest.mark.asyncio
-    async def test_screenshot_valid(self, manager, tmp_path):
-        """Test taking screenshot with valid path."""
-        from server import screenshot
-
-        screenshot_path = tmp_path / "test.png"
-        result = await screenshot(str(screenshot_path))
+    async def test_screenshot_valid(
+        self, manager, screenshot_dir, filename, image_format, omit_background
+    ):
+        """Test taking screenshot in each supported format."""
+        result = await screenshot(
+            str(screenshot_dir / filename), omit_background=omit_background
+        )
 
         assert result["success"] is True, "Screenshot should succeed"
         assert "path" in result, "Result should contain path"
@@ -234,87 +431,95 @@ class TestScreenshot:
         assert Path(result["path"]).exists(), "Screenshot file should exist"
         assert result["file_size"] > 0, "File size should be greater than 0"
 
+        data = Path(result["path"]).read_bytes()
+        assert _image_format(data) == image_format, f"File should be a {image_format} image"
+
+
+class TestValidationErrors:
+    """Test suite for invalid tool input; every case is rejected before the browser is used."""
+
+    @pytest.mark.parametrize("tool,args", [
+        (click_element, ("",)),
+        (fill_input, ("", "test text")),
+        (extract_text, ("",)),
+        (screenshot, ("",)),
+        (screenshot, ("test.txt",)),
+    ], ids=[
+        "click_empty_selector",
+        "fill_empty_selector",
+        "extract_text_empty_selector",
+        "screenshot_empty_path",
+        "screenshot_invalid_extension",
+    ])
     @pytest.mark.asyncio
-    async def test_screenshot_invalid_extension(self, manager, tmp_path):
-        """Test screenshot with invalid file extension."""
-        from server import screenshot
-
-        screenshot_path = tmp_path / "test.txt"
-        result = await screenshot(str(screenshot_path))
-
-        assert result["success"] is False, "Should fail for invalid extension"
+    async def test_validation_error(self, tool, args):
+        """Test that invalid input returns a ValidationError response."""
+        result = await tool(*args)
+        assert result["success"] is False, "Should fail for invalid input"
         assert result["error_type"] == "ValidationError", "Should be validation error"
 
+    @pytest.mark.parametrize("path", ["", "   "])
     @pytest.mark.asyncio
-    async def test_screenshot_empty_path(self, manager):
-        """Test screenshot with empty path."""
-        from server import screenshot
+    async def test_screenshot_empty_path_message(self, path):
+        """Test that only blank paths are reported as empty."""
+        result = await screenshot(path)
+        assert result["error"] == "Path cannot be empty", "Should report an empty path"
 
-        result = await screenshot("")
-        assert result["success"] is False, "Should fail for empty path"
+    @pytest.mark.parametrize("path", ["/", "./", "shots/"])
+    @pytest.mark.asyncio
+    async def test_screenshot_directory_path(self, path):
+        """Test that directory paths are reported as an invalid extension, not as empty."""
+        result = await screenshot(path)
         assert result["error_type"] == "ValidationError", "Should be validation error"
-
-
-class TestGetPageInfo:
-    """Test suite for get_page_info tool."""
-
-    @pytest.fixture
-    async def manager(self):
-        """Fixture to provide a fresh browser manager."""
-        from browser_manager import BrowserManager
-        manager = BrowserManager()
-        page = await manager.get_page()
-        await page.goto("https://example.com")
-        yield manager
-        await manager.cleanup()
+        assert result["error"].startswith("Invalid file extension"), (
+            "Should report an invalid extension"
+        )
 
     @pytest.mark.asyncio
-    async def test_get_page_info(self, manager):
-        """Test getting page information."""
-        from server import get_page_info
-
-        result = await get_page_info()
-        assert result["success"] is True, "Should succeed"
-        assert "url" in result, "Result should contain URL"
-        assert "title" in result, "Result should contain title"
-        assert "viewport" in result, "Result should contain viewport"
-        assert "example.com" in result["url"].lower(), "Should be on example.com"
-
-
-class TestErrorHandling:
-    """Test suite for error handling utilities."""
-
-    def test_parse_playwright_error_dns(self):
-        """Test parsing DNS errors."""
-        from server import parse_playwright_error
-
-        error = Exception("net::ERR_NAME_NOT_RESOLVED")
-        error_type, suggestion = parse_playwright_error(error)
-        assert error_type == "NetworkError", "Should be NetworkError"
-        assert "DNS" in suggestion, "Suggestion should mention DNS"
+    async def test_navigate_invalid_url(self):
+        """Test navigation with invalid URL (missing protocol)."""
+        result = await navigate("example.com")
+        assert result["success"] is False, "Should fail for URL without protocol"
+        assert result["error_type"] == "ValidationError", "Should be validation error"
+        assert "http://" in result["suggestion"], "Suggestion should mention http://"
 
-    def test_parse_playwright_error_timeout(self):
-        """Test parsing timeout errors."""
-        from server import parse_playwright_error
+    @pytest.mark.asyncio
+    async def test_navigate_invalid_wait_until(self):
+        """Test that the tool schema rejects an invalid wait_until value."""
+        with pytest.raises(Exception, match="wait_until"):
+            await server.call_tool(
+                "navigate", {"url": "https://example.com", "wait_until": "invalid"}
+            )
 
-        error = TimeoutError("Operation timed out")
-        error_type, suggestion = parse_playwright_error(error)
-        assert error_type == "TimeoutError", "Should be TimeoutError"
-        assert "timeout" in suggestion.lower(), "Suggestion should mention timeout"
 
-    def test_create_error_response(self):
-        """Test error response creation."""
-        from server import create_error_response
+class TestHappyPath:
+    """End-to-end run of the read-only tools against one page load."""
 
-        result = create_error_response(
-            "ValidationError",
-            "Invalid input",
-            "Check your input",
-            url="https://example.com"
+    @pytest.mark.asyncio
+    async def test_navigate_then_inspect(self, session_manager, base_url, screenshot_dir):
+        """Test page info, text extraction and screenshot after a single navigation."""
+        # A path no other test loads, so the page really navigates
+        result = await navigate(f"{base_url}/happy", wait_until="domcontentloaded")
+        assert result["success"] is True, "Navigation should succeed"
+        assert result["status"] == 200, "Should report the HTTP status"
+
+        # acquire() serializes tool calls, so there is nothing to gain from gather
+        info = await get_page_info()
+        text = await extract_text("h1")
+        shot = await screenshot(str(screenshot_dir / "happy_path.png"))
+
+        assert info["success"] is True, "Page info should succeed"
+        assert info["url"] == f"{base_url}/happy", "Should be on the example page"
+        assert info["title"] == "Example Domain", "Should report the page title"
+        assert info["viewport"] == session_manager.get_viewport_size(), (
+            "Should report the configured viewport"
         )
+        assert info["viewport"]["width"] > 0, "Width should be positive"
+        assert info["viewport"]["height"] > 0, "Height should be positive"
+
+        assert text["success"] is True, "Text extraction should succeed"
+        assert text["text"] == "Example Domain", "Should extract the heading text"
 
-        assert result["success"] is False, "Should have success=False"
-        assert result["error_type"] == "ValidationError", "Should have correct error_type"
-        assert result["error"] == "Invalid input", "Should have error message"
-        assert result["suggestion"] == "Check your input", "Should have suggestion"
-        assert result["url"] == "https://example.com", "Should include extra kwargs"
+        assert shot["success"] is True, "Screenshot should succeed"
+        assert Path(shot["path"]).exists(), "Screenshot file should exist"
+        assert shot["file_size"] > 0, "File size should be greater than 0"